@@ -4,11 +4,15 @@ A robust Python application that syncs Gmail messages to a local SQLite database
 for analysis and archival purposes.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict
+
 __version__ = "0.2.0"
 
-from .auth import get_credentials
-from .db import init, Message, create_message, get_all_message_ids
-from .sync import all_messages, single_message, get_labels
+if TYPE_CHECKING:
+    from .auth import get_credentials
+    from .db import init, Message, create_message, get_all_message_ids
+    from .sync import all_messages, single_message, get_labels
 
 __all__ = [
     "get_credentials",
@@ -20,3 +24,35 @@ __all__ = [
     "single_message",
     "get_labels",
 ]
+
+# The Google API client libraries take a noticeable time to import, so the
+# public API is resolved on first access instead of at package import.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "get_credentials": ".auth",
+    "init": ".db",
+    "Message": ".db",
+    "create_message": ".db",
+    "get_all_message_ids": ".db",
+    "all_messages": ".sync",
+    "single_message": ".sync",
+    "get_labels": ".sync",
+}
+
+# Submodules stay reachable as package attributes, as they were when the public
+# API was imported eagerly.
+_LAZY_SUBMODULES = frozenset(
+    {"auth", "constants", "db", "message", "migrations", "sync"}
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return import_module(f".{name}", __name__)
+
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
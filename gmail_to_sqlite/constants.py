@@ -2,7 +2,7 @@
 Constants and configuration values for the Gmail to SQLite application.
 """
 
-from typing import List
+from typing import Dict, FrozenSet, List, Union
 
 # API Configuration
 GMAIL_API_VERSION: str = "v1"
@@ -11,11 +11,29 @@ OAUTH2_CREDENTIALS_FILE: str = "credentials.json"
 TOKEN_FILE_NAME: str = "token.json"
 DATABASE_FILE_NAME: str = "messages.db"
 
+# Database Configuration
+# WAL lets the sync workers write while readers keep querying the database, and
+# synchronous=normal avoids an fsync on every per-message commit.
+SQLITE_PRAGMAS: Dict[str, Union[str, int]] = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+}
+
 # Sync Configuration
 MAX_RESULTS_PER_PAGE: int = 500
 DEFAULT_WORKERS: int = 4
+MAX_QUEUED_TASKS_PER_WORKER: int = 4
 MAX_RETRY_ATTEMPTS: int = 3
 RETRY_DELAY_SECONDS: int = 5
+MAX_RETRY_DELAY_SECONDS: int = 60
+RETRY_SLEEP_SLICE_SECONDS: float = 0.5
+# Legacy `errors[].reason` values and the google.rpc.ErrorInfo reason
+RATE_LIMIT_REASONS: FrozenSet[str] = frozenset(
+    {"rateLimitExceeded", "userRateLimitExceeded", "RATE_LIMIT_EXCEEDED"}
+)
+
+# Message headers stored as recipients, keyed by lowercase header name
+RECIPIENT_HEADERS: FrozenSet[str] = frozenset({"to", "cc", "bcc"})
 
 # MIME Types for email body extraction
 SUPPORTED_MIME_TYPES: List[str] = [
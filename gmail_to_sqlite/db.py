@@ -9,11 +9,10 @@ from peewee import (
     Model,
     Proxy,
     TextField,
-    SQL,
 )
 from playhouse.sqlite_ext import JSONField, SqliteDatabase
 
-from .constants import DATABASE_FILE_NAME
+from .constants import DATABASE_FILE_NAME, SQLITE_PRAGMAS
 
 database_proxy = Proxy()
 
@@ -102,7 +101,7 @@ def init(data_dir: str, enable_logging: bool = False) -> SqliteDatabase:
     """
     try:
         db_path = f"{data_dir}/{DATABASE_FILE_NAME}"
-        db = SqliteDatabase(db_path)
+        db = SqliteDatabase(db_path, pragmas=SQLITE_PRAGMAS)
         database_proxy.initialize(db)
         db.create_tables([Message, SchemaVersion])
 
@@ -168,7 +167,7 @@ def last_indexed() -> Optional[datetime]:
         Optional[datetime]: The timestamp of the last indexed message, or None if no messages exist.
     """
 
-    msg = Message.select().order_by(Message.timestamp.desc()).first()
+    msg = Message.select(Message.timestamp).order_by(Message.timestamp.desc()).first()
     if msg:
         timestamp: Optional[datetime] = msg.timestamp
         return timestamp
@@ -184,7 +183,7 @@ def first_indexed() -> Optional[datetime]:
         Optional[datetime]: The timestamp of the first indexed message, or None if no messages exist.
     """
 
-    msg = Message.select().order_by(Message.timestamp.asc()).first()
+    msg = Message.select(Message.timestamp).order_by(Message.timestamp.asc()).first()
     if msg:
         timestamp: Optional[datetime] = msg.timestamp
         return timestamp
@@ -206,17 +205,16 @@ def mark_messages_as_deleted(message_ids: List[str]) -> None:
         return
 
     try:
-        if not message_ids:
-            return
-
-        # Use the SQL IN clause with proper parameter binding
-        batch_size = 100
-        for i in range(0, len(message_ids), batch_size):
-            batch = message_ids[i : i + batch_size]
-            placeholders = ",".join(["?" for _ in batch])
-            query = Message.update(is_deleted=True, last_indexed=datetime.now())
-            query = query.where(SQL(f"message_id IN ({placeholders})", batch))
-            query.execute()
+        # Batches stay below SQLite's historical limit of 999 bound parameters,
+        # and one transaction around them avoids a commit per batch.
+        batch_size = 500
+        last_indexed = datetime.now()
+        with database_proxy.atomic():
+            for i in range(0, len(message_ids), batch_size):
+                batch = message_ids[i : i + batch_size]
+                Message.update(is_deleted=True, last_indexed=last_indexed).where(
+                    Message.message_id.in_(batch)
+                ).execute()
     except Exception as e:
         raise DatabaseError(f"Failed to mark messages as deleted: {e}")
 
@@ -232,11 +230,33 @@ def get_all_message_ids() -> List[str]:
         DatabaseError: If the query fails.
     """
     try:
-        return [message.message_id for message in Message.select(Message.message_id)]
+        query = Message.select(Message.message_id).tuples()
+        return [message_id for (message_id,) in query.iterator()]
     except Exception as e:
         raise DatabaseError(f"Failed to retrieve message IDs: {e}")
 
 
+def get_active_message_ids() -> List[str]:
+    """
+    Returns all message IDs that are not marked as deleted.
+
+    Returns:
+        List[str]: List of active message IDs.
+
+    Raises:
+        DatabaseError: If the query fails.
+    """
+    try:
+        query = (
+            Message.select(Message.message_id)
+            .where(Message.is_deleted == False)
+            .tuples()
+        )
+        return [message_id for (message_id,) in query.iterator()]
+    except Exception as e:
+        raise DatabaseError(f"Failed to retrieve active message IDs: {e}")
+
+
 def get_deleted_message_ids() -> List[str]:
     """
     Returns all message IDs that are already marked as deleted.
@@ -248,11 +268,11 @@ def get_deleted_message_ids() -> List[str]:
         DatabaseError: If the query fails.
     """
     try:
-        return [
-            message.message_id
-            for message in Message.select(Message.message_id).where(
-                Message.is_deleted == True
-            )
-        ]
+        query = (
+            Message.select(Message.message_id)
+            .where(Message.is_deleted == True)
+            .tuples()
+        )
+        return [message_id for (message_id,) in query.iterator()]
     except Exception as e:
         raise DatabaseError(f"Failed to retrieve deleted message IDs: {e}")
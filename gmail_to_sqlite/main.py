@@ -5,7 +5,6 @@ import signal
 import sys
 from typing import Any, Callable, List, Optional
 
-from . import auth, db, sync
 from .constants import DEFAULT_WORKERS, LOG_FORMAT
 
 
@@ -142,6 +141,10 @@ def main() -> None:
         if args.command == "sync-message" and not args.message_id:
             parser.error("--message-id is required for sync-message command")
 
+        # Imported after argument parsing so --help and usage errors don't pay
+        # for loading the Google API client libraries.
+        from . import auth, db, sync
+
         prepare_data_dir(args.data_dir)
         credentials = auth.get_credentials(args.data_dir)
 
@@ -172,6 +175,8 @@ def main() -> None:
             elif args.command == "sync-deleted-messages":
                 sync.sync_deleted_messages(credentials, check_shutdown=check_shutdown)
 
+            # Keep planner statistics current for the indexes used by later syncs
+            db_conn.execute_sql("PRAGMA optimize")
             db_conn.close()
             logging.info("Operation completed successfully")
 
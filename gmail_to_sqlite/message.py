@@ -5,7 +5,7 @@ from typing import Dict, List, Optional
 
 from bs4 import BeautifulSoup
 
-from .constants import SUPPORTED_MIME_TYPES
+from .constants import RECIPIENT_HEADERS, SUPPORTED_MIME_TYPES
 
 
 class MessageParsingError(Exception):
@@ -166,12 +166,8 @@ class Message:
                 if name == "from":
                     addr = parseaddr(value)
                     self.sender = {"name": addr[0], "email": addr[1]}
-                elif name == "to":
-                    self.recipients["to"] = self.parse_addresses(value)
-                elif name == "cc":
-                    self.recipients["cc"] = self.parse_addresses(value)
-                elif name == "bcc":
-                    self.recipients["bcc"] = self.parse_addresses(value)
+                elif name in RECIPIENT_HEADERS:
+                    self.recipients[name] = self.parse_addresses(value)
                 elif name == "subject":
                     self.subject = value
                 elif name == "date" and self.timestamp is None:
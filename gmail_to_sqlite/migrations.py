@@ -6,7 +6,8 @@ when new features are added or existing schema needs to be modified.
 """
 
 import logging
-from typing import Optional
+from importlib import import_module
+from typing import List, Optional, Tuple
 
 from peewee import BooleanField, SQL
 from playhouse.migrate import SqliteMigrator, migrate
@@ -16,6 +17,16 @@ from .db import database_proxy, Message, SchemaVersion
 
 logger = logging.getLogger(__name__)
 
+# Ordered (version, description, module) entries for schema_migrations. The
+# modules are imported lazily because they depend on this module. A module may
+# define is_supported(); while it returns False the migration and all later ones
+# are deferred, leaving the schema version unchanged so they run after upgrading.
+MIGRATIONS: List[Tuple[int, str, str]] = [
+    (1, "add is_deleted column", "v1_add_is_deleted_column"),
+    (2, "add timestamp index", "v2_add_timestamp_index"),
+    (3, "add sender email index", "v3_add_sender_email_index"),
+]
+
 
 def column_exists(table_name: str, column_name: str) -> bool:
     """
@@ -29,10 +40,12 @@ def column_exists(table_name: str, column_name: str) -> bool:
         bool: True if the column exists, False otherwise.
     """
     try:
-        # PRAGMA table_info doesn't support parameter binding for table names
-        cursor = database_proxy.obj.execute_sql(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
-        return column_name in columns
+        # The table-valued form of PRAGMA table_info accepts bound parameters
+        cursor = database_proxy.obj.execute_sql(
+            "SELECT 1 FROM pragma_table_info(?) WHERE name = ?",
+            (table_name, column_name),
+        )
+        return cursor.fetchone() is not None
     except Exception as e:
         logger.error(f"Error checking if column {column_name} exists: {e}")
         return False
@@ -89,25 +102,36 @@ def run_migrations() -> bool:
         current_version = get_schema_version()
         logger.info(f"Current schema version: {current_version}")
 
-        if current_version == 0:
-            logger.info("Running migration v1: add is_deleted column")
-            from .schema_migrations.v1_add_is_deleted_column import run
-
-            if run():
-                if set_schema_version(1):
-                    logger.info("Migration v1 completed successfully, version set to 1")
-                else:
-                    logger.error("Failed to set schema version to 1")
-                    return False
-            else:
-                logger.error("Migration v1 failed")
-                return False
-        elif current_version >= 1:
+        if current_version >= MIGRATIONS[-1][0]:
             logger.info(
                 f"Database already at version {current_version}, no migrations needed"
             )
-        else:
-            logger.warning(f"Unexpected schema version {current_version}")
+
+        for version, description, module_name in MIGRATIONS:
+            if version <= current_version:
+                continue
+
+            logger.info(f"Running migration v{version}: {description}")
+            migration = import_module(f".schema_migrations.{module_name}", __package__)
+
+            is_supported = getattr(migration, "is_supported", None)
+            if is_supported is not None and not is_supported():
+                logger.warning(
+                    f"Migration v{version} is not supported by this SQLite "
+                    f"version, deferring it and later migrations; schema stays "
+                    f"at version {get_schema_version()}"
+                )
+                return True
+
+            if not migration.run():
+                logger.error(f"Migration v{version} failed")
+                return False
+            if not set_schema_version(version):
+                logger.error(f"Failed to set schema version to {version}")
+                return False
+            logger.info(
+                f"Migration v{version} completed successfully, version set to {version}"
+            )
 
         logger.info("All migrations completed successfully")
         return True
@@ -0,0 +1,38 @@
+"""
+Migration v2: Add an index on the timestamp column of the messages table.
+
+Incremental syncs look up the newest and oldest stored message on every run,
+which without an index means scanning and sorting the whole table.
+"""
+
+import logging
+
+from ..db import database_proxy
+
+logger = logging.getLogger(__name__)
+
+
+def run() -> bool:
+    """
+    Create the timestamp index on the messages table if it doesn't exist.
+
+    Returns:
+        bool: True if the migration was successful or the index already exists,
+              False if the migration failed.
+    """
+    table_name = "messages"
+    index_name = "message_timestamp"
+
+    try:
+        logger.info(f"Creating index {index_name} on {table_name} table")
+
+        database_proxy.obj.execute_sql(
+            f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ("timestamp")'
+        )
+
+        logger.info(f"Successfully created index {index_name} on {table_name} table")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to create index {index_name}: {e}")
+        return False
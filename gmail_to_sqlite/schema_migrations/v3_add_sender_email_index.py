@@ -0,0 +1,57 @@
+"""
+Migration v3: Add an expression index on the sender email of the messages table.
+
+Most analysis queries group or filter by sender->>'$.email'. Without an index
+SQLite re-parses the sender JSON of every row for each such query.
+"""
+
+import logging
+import sqlite3
+
+from ..db import database_proxy
+
+logger = logging.getLogger(__name__)
+
+# The ->> operator used by the index expression was added in SQLite 3.38.0
+MIN_SQLITE_VERSION = (3, 38, 0)
+
+
+def is_supported() -> bool:
+    """
+    Check whether the running SQLite supports the index expression.
+
+    Returns:
+        bool: True if SQLite has the ->> operator, False otherwise.
+    """
+    return sqlite3.sqlite_version_info >= MIN_SQLITE_VERSION
+
+
+def run() -> bool:
+    """
+    Create the sender email index on the messages table if it doesn't exist.
+
+    The indexed expression matches the one used in the README example queries,
+    so SQLite can use the index for them. Callers must check is_supported()
+    first, as older SQLite versions reject the expression.
+
+    Returns:
+        bool: True if the migration was successful or the index already exists,
+              False if the migration failed.
+    """
+    table_name = "messages"
+    index_name = "message_sender_email"
+
+    try:
+        logger.info(f"Creating index {index_name} on {table_name} table")
+
+        database_proxy.obj.execute_sql(
+            f'CREATE INDEX IF NOT EXISTS "{index_name}" '
+            f"ON \"{table_name}\" (sender->>'$.email')"
+        )
+
+        logger.info(f"Successfully created index {index_name} on {table_name} table")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to create index {index_name}: {e}")
+        return False
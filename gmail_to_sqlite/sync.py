@@ -1,6 +1,9 @@
 import concurrent.futures
+import json
 import logging
+import random
 import socket
+import threading
 import time
 from typing import Any, Callable, Dict, List, Optional, Set
 
@@ -12,11 +15,15 @@ from . import db, message
 from .constants import (
     DEFAULT_WORKERS,
     GMAIL_API_VERSION,
+    MAX_QUEUED_TASKS_PER_WORKER,
     MAX_RESULTS_PER_PAGE,
     MAX_RETRY_ATTEMPTS,
+    MAX_RETRY_DELAY_SECONDS,
     RETRY_DELAY_SECONDS,
+    RETRY_SLEEP_SLICE_SECONDS,
     PROGRESS_LOG_INTERVAL,
     COLLECTION_LOG_INTERVAL,
+    RATE_LIMIT_REASONS,
 )
 
 
@@ -26,6 +33,127 @@ class SyncError(Exception):
     pass
 
 
+def _retry_delay(attempt: int) -> float:
+    """
+    Returns how long to wait before retrying after a failed attempt.
+
+    The delay grows exponentially with each attempt and is jittered so that
+    parallel workers hitting the same transient error do not retry in lockstep.
+
+    Args:
+        attempt: The zero-based index of the attempt that just failed.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    delay = min(float(MAX_RETRY_DELAY_SECONDS), RETRY_DELAY_SECONDS * (2.0**attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _interruptible_sleep(
+    delay: float, check_interrupt: Optional[Callable[[], bool]] = None
+) -> None:
+    """
+    Sleeps for the given delay in short slices, polling for interruption.
+
+    Retry waits can last up to MAX_RETRY_DELAY_SECONDS, so a shutdown request
+    must not have to wait for the whole delay to elapse.
+
+    Args:
+        delay: The number of seconds to sleep.
+        check_interrupt: Optional callback that returns True if process should be interrupted.
+
+    Raises:
+        InterruptedError: If the process was interrupted before or during the sleep.
+    """
+    deadline = time.monotonic() + delay
+    while True:
+        if check_interrupt and check_interrupt():
+            raise InterruptedError("Process was interrupted")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, RETRY_SLEEP_SLICE_SECONDS))
+
+
+def _retry_after_seconds(error: HttpError) -> Optional[float]:
+    """
+    Returns the retry delay requested by the server through a Retry-After header.
+
+    Args:
+        error: The HttpError raised by the Gmail API client.
+
+    Returns:
+        Optional[float]: The delay in seconds capped at MAX_RETRY_DELAY_SECONDS,
+            or None if the header is missing or not given in seconds.
+    """
+    value = error.resp.get("retry-after")
+    if value is None:
+        return None
+
+    try:
+        return min(float(MAX_RETRY_DELAY_SECONDS), max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_error_reasons(error: HttpError) -> Set[str]:
+    """
+    Collects the machine-readable reasons from an HttpError response body.
+
+    Google error bodies may carry both the legacy `errors` list and the newer
+    `details` list of google.rpc.ErrorInfo entries, so both are read.
+
+    Args:
+        error: The HttpError raised by the Gmail API client.
+
+    Returns:
+        Set[str]: The reasons found in the body, empty if it cannot be decoded.
+    """
+    try:
+        content = error.content
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        body = json.loads(content).get("error", {})
+    except (AttributeError, TypeError, ValueError):
+        return set()
+
+    if not isinstance(body, dict):
+        return set()
+
+    reasons = set()
+    for key in ("errors", "details"):
+        entries = body.get(key)
+        if not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if isinstance(entry, dict) and isinstance(entry.get("reason"), str):
+                reasons.add(entry["reason"])
+    return reasons
+
+
+def _is_retryable_http_error(error: HttpError) -> bool:
+    """
+    Checks whether an HttpError is transient and worth retrying.
+
+    Gmail signals rate limiting either with a 429 or with a 403 carrying a
+    rate-limit reason, and transient backend failures with a 5xx status.
+
+    Args:
+        error: The HttpError raised by the Gmail API client.
+
+    Returns:
+        bool: True if the request should be retried, False otherwise.
+    """
+    status = error.resp.status
+    if status == 429 or status >= 500:
+        return True
+
+    return status == 403 and not _http_error_reasons(error).isdisjoint(
+        RATE_LIMIT_REASONS
+    )
+
+
 def _fetch_message(
     service: Any,
     message_id: str,
@@ -59,14 +187,15 @@ def _fetch_message(
             return message.Message.from_raw(raw_msg, labels)
 
         except HttpError as e:
-            if e.resp.status >= 500 and attempt < MAX_RETRY_ATTEMPTS - 1:
+            if _is_retryable_http_error(e) and attempt < MAX_RETRY_ATTEMPTS - 1:
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = _retry_delay(attempt)
                 logging.warning(
                     f"Attempt {attempt + 1}/{MAX_RETRY_ATTEMPTS} failed for message {message_id} "
-                    f"due to server error {e.resp.status}. Retrying in {RETRY_DELAY_SECONDS}s..."
+                    f"due to HttpError {e.resp.status}. Retrying in {delay:.1f}s..."
                 )
-                if check_interrupt and check_interrupt():
-                    raise InterruptedError("Process was interrupted")
-                time.sleep(RETRY_DELAY_SECONDS)
+                _interruptible_sleep(delay, check_interrupt)
             else:
                 error_msg = (
                     f"Failed to fetch message {message_id} after {attempt + 1} attempts "
@@ -77,13 +206,12 @@ def _fetch_message(
 
         except (TimeoutError, socket.timeout) as e:
             if attempt < MAX_RETRY_ATTEMPTS - 1:
+                delay = _retry_delay(attempt)
                 logging.warning(
                     f"Attempt {attempt + 1}/{MAX_RETRY_ATTEMPTS} failed for message {message_id} "
-                    f"due to timeout. Retrying in {RETRY_DELAY_SECONDS}s..."
+                    f"due to timeout. Retrying in {delay:.1f}s..."
                 )
-                if check_interrupt and check_interrupt():
-                    raise InterruptedError("Process was interrupted")
-                time.sleep(RETRY_DELAY_SECONDS)
+                _interruptible_sleep(delay, check_interrupt)
             else:
                 error_msg = (
                     f"Failed to fetch message {message_id} after {attempt + 1} attempts "
@@ -97,9 +225,7 @@ def _fetch_message(
                 f"Unexpected error processing message {message_id} on attempt {attempt + 1}: {str(e)}"
             )
             if attempt < MAX_RETRY_ATTEMPTS - 1:
-                if check_interrupt and check_interrupt():
-                    raise InterruptedError("Process was interrupted")
-                time.sleep(RETRY_DELAY_SECONDS)
+                _interruptible_sleep(_retry_delay(attempt), check_interrupt)
             else:
                 error_msg = f"Failed to fetch message {message_id} after {MAX_RETRY_ATTEMPTS} attempts"
                 logging.error(error_msg)
@@ -171,6 +297,7 @@ def get_message_ids_from_gmail(
         SyncError: If message ID collection fails.
     """
     all_message_ids = []
+    seen_message_ids: Set[str] = set()
     page_token = None
     collected_count = 0
 
@@ -193,7 +320,12 @@ def get_message_ids_from_gmail(
             messages_page = results.get("messages", [])
 
             for m_info in messages_page:
-                all_message_ids.append(m_info["id"])
+                # Pages can overlap when the mailbox changes during listing
+                message_id = m_info["id"]
+                if message_id in seen_message_ids:
+                    continue
+                seen_message_ids.add(message_id)
+                all_message_ids.append(message_id)
                 collected_count += 1
 
                 if collected_count % COLLECTION_LOG_INTERVAL == 0:
@@ -235,13 +367,13 @@ def _detect_and_mark_deleted_messages(
         int: Number of messages newly marked as deleted, or None if no action taken.
     """
     try:
-        db_message_ids = set(db.get_all_message_ids())
+        active_message_ids = set(db.get_active_message_ids())
         logging.info(
-            f"Retrieved {len(db_message_ids)} message IDs from database for deletion detection"
+            f"Retrieved {len(active_message_ids)} active message IDs from database for deletion detection"
         )
 
-        if not db_message_ids:
-            logging.info("No messages in database to check for deletion")
+        if not active_message_ids:
+            logging.info("No active messages in database to check for deletion")
             return None
 
         if check_shutdown and check_shutdown():
@@ -250,19 +382,7 @@ def _detect_and_mark_deleted_messages(
             )
             return None
 
-        already_deleted_ids = set(db.get_deleted_message_ids())
-        if already_deleted_ids:
-            logging.info(
-                f"Found {len(already_deleted_ids)} already deleted messages to skip"
-            )
-
-        gmail_ids_set = set(gmail_message_ids)
-        potential_deleted_ids = db_message_ids - gmail_ids_set
-        new_deleted_ids = (
-            list(potential_deleted_ids - already_deleted_ids)
-            if already_deleted_ids
-            else list(potential_deleted_ids)
-        )
+        new_deleted_ids = list(active_message_ids.difference(gmail_message_ids))
 
         if new_deleted_ids:
             logging.info(f"Found {len(new_deleted_ids)} new deleted messages to mark")
@@ -299,9 +419,6 @@ def all_messages(
     Returns:
         int: The number of messages successfully synced.
     """
-    executor = None
-    future_to_id = {}
-
     try:
         query = []
         if not full_sync:
@@ -331,11 +448,22 @@ def all_messages(
         total_synced_count = 0
         processed_count = 0
 
+        # The underlying httplib2 client is not thread-safe, so each worker
+        # thread builds its service once and reuses it for all its messages.
+        thread_local = threading.local()
+
+        def get_thread_service() -> Any:
+            thread_service = getattr(thread_local, "service", None)
+            if thread_service is None:
+                thread_service = _create_service(credentials)
+                thread_local.service = thread_service
+            return thread_service
+
         def thread_worker(message_id: str) -> bool:
             if check_shutdown and check_shutdown():
                 return False
 
-            service = _create_service(credentials)
+            service = get_thread_service()
 
             try:
                 msg = _fetch_message(
@@ -362,43 +490,54 @@ def all_messages(
                 logging.error(f"Failed to fetch message {message_id}: {str(e)}")
                 return False
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=num_workers
-        ) as executor_instance:
-            executor = executor_instance
-            future_to_id = {
-                executor.submit(thread_worker, msg_id): msg_id
-                for msg_id in all_message_ids
-            }
-
-            for future in concurrent.futures.as_completed(future_to_id):
-                if check_shutdown and check_shutdown() and not future.running():
-                    continue
-
-                message_id = future_to_id[future]
-                processed_count += 1
-                try:
-                    if not future.cancelled():
-                        if future.result():
-                            total_synced_count += 1
-                    if (
-                        processed_count % PROGRESS_LOG_INTERVAL == 0
-                        or processed_count == len(all_message_ids)
-                    ):
+        # Only keep a bounded number of tasks queued so memory stays flat on
+        # large mailboxes and a shutdown has little queued work to drain.
+        max_pending = num_workers * MAX_QUEUED_TASKS_PER_WORKER
+        pending_ids = iter(all_message_ids)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            future_to_id: Dict[concurrent.futures.Future, str] = {}
+
+            def submit_pending() -> None:
+                while len(future_to_id) < max_pending and not (
+                    check_shutdown and check_shutdown()
+                ):
+                    msg_id = next(pending_ids, None)
+                    if msg_id is None:
+                        return
+                    future_to_id[executor.submit(thread_worker, msg_id)] = msg_id
+
+            submit_pending()
+            while future_to_id:
+                done, _ = concurrent.futures.wait(
+                    future_to_id, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    message_id = future_to_id.pop(future)
+                    if check_shutdown and check_shutdown():
+                        continue
+
+                    processed_count += 1
+                    try:
+                        if not future.cancelled():
+                            if future.result():
+                                total_synced_count += 1
+                        if (
+                            processed_count % PROGRESS_LOG_INTERVAL == 0
+                            or processed_count == len(all_message_ids)
+                        ):
+                            logging.info(
+                                f"Processed {processed_count}/{len(all_message_ids)} messages..."
+                            )
+                    except concurrent.futures.CancelledError:
                         logging.info(
-                            f"Processed {processed_count}/{len(all_message_ids)} messages..."
+                            f"Task for message {message_id} was cancelled due to shutdown"
                         )
-                except concurrent.futures.CancelledError:
-                    logging.info(
-                        f"Task for message {message_id} was cancelled due to shutdown"
-                    )
-                except Exception as exc:
-                    logging.error(
-                        f"Message ID {message_id} generated an exception during future processing: {exc}"
-                    )
-                    logging.error(
-                        f"Message ID {message_id} generated an exception during future processing: {exc}"
-                    )
+                    except Exception as exc:
+                        logging.error(
+                            f"Message ID {message_id} generated an exception during future processing: {exc}"
+                        )
+                submit_pending()
 
         if check_shutdown and check_shutdown():
             logging.info("Sync process was interrupted. Partial results saved.")
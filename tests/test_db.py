@@ -1,7 +1,34 @@
 """Tests for database functionality."""
 
 import pytest
-from gmail_to_sqlite.db import init, Message
+from datetime import datetime
+from gmail_to_sqlite.db import (
+    init,
+    Message,
+    create_message,
+    first_indexed,
+    get_active_message_ids,
+    last_indexed,
+    get_all_message_ids,
+    get_deleted_message_ids,
+    mark_messages_as_deleted,
+)
+from gmail_to_sqlite.message import Message as ParsedMessage
+
+
+def make_message(message_id, timestamp=None):
+    """Build a parsed message with the fields create_message needs."""
+    msg = ParsedMessage()
+    msg.id = message_id
+    msg.thread_id = f"thread-{message_id}"
+    msg.sender = {"name": "Sender", "email": "sender@example.com"}
+    msg.recipients = {"to": [{"name": "", "email": "me@example.com"}]}
+    msg.labels = ["INBOX"]
+    msg.subject = f"Subject {message_id}"
+    msg.body = "Body"
+    msg.size = 100
+    msg.timestamp = timestamp or datetime(2024, 1, 1, 12, 0, 0)
+    return msg
 
 
 class TestDatabase:
@@ -13,6 +40,13 @@ class TestDatabase:
         db = init(db_path)
         assert db is not None
 
+    def test_initialize_database_pragmas(self, temp_dir):
+        """Test that the database is opened in WAL mode."""
+        db = init(str(temp_dir))
+        journal_mode = db.execute_sql("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+        db.close()
+
     def test_message_model(self):
         """Test Message model creation."""
         # Test that the model exists and has required fields
@@ -22,3 +56,32 @@ class TestDatabase:
         assert hasattr(Message, "thread_id")
         assert hasattr(Message, "sender")
         assert hasattr(Message, "recipients")
+
+    def test_mark_messages_as_deleted(self, temp_dir):
+        """Test marking messages as deleted across several batches."""
+        db = init(str(temp_dir))
+        message_ids = [f"msg{i}" for i in range(1200)]
+        with db.atomic():
+            for message_id in message_ids:
+                create_message(make_message(message_id))
+
+        mark_messages_as_deleted(message_ids[:1100])
+
+        assert set(get_deleted_message_ids()) == set(message_ids[:1100])
+        assert set(get_active_message_ids()) == set(message_ids[1100:])
+        assert len(get_all_message_ids()) == 1200
+        db.close()
+
+    def test_first_and_last_indexed(self, temp_dir):
+        """Test retrieving the oldest and newest message timestamps."""
+        db = init(str(temp_dir))
+        assert first_indexed() is None
+        assert last_indexed() is None
+
+        create_message(make_message("new", datetime(2024, 6, 1, 8, 30, 0)))
+        create_message(make_message("old", datetime(2023, 1, 1, 9, 0, 0)))
+        create_message(make_message("mid", datetime(2024, 1, 1, 10, 0, 0)))
+
+        assert first_indexed() == datetime(2023, 1, 1, 9, 0, 0)
+        assert last_indexed() == datetime(2024, 6, 1, 8, 30, 0)
+        db.close()
@@ -0,0 +1,35 @@
+"""Tests for the package's lazily resolved public API."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "gmail_to_sqlite.sync.all_messages",
+        "gmail_to_sqlite.db.Message",
+        "gmail_to_sqlite.auth.get_credentials",
+        "gmail_to_sqlite.message.Message",
+        "gmail_to_sqlite.all_messages",
+    ],
+)
+def test_attribute_access_after_bare_import(expression):
+    """Test that submodules and the public API resolve after a bare import."""
+    # A fresh interpreter ensures no other test has imported the submodules yet
+    result = subprocess.run(
+        [sys.executable, "-c", f"import gmail_to_sqlite; {expression}"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_unknown_attribute_raises():
+    """Test that unknown attributes still raise AttributeError."""
+    import gmail_to_sqlite
+
+    with pytest.raises(AttributeError):
+        gmail_to_sqlite.does_not_exist
@@ -50,3 +50,24 @@ class TestMessageParsing:
         parsed = message.parse_addresses(addresses)
         assert isinstance(parsed, list)
         assert len(parsed) >= 1
+
+    def test_parse_recipient_headers(self):
+        """Test that To, Cc and Bcc headers are parsed into recipients."""
+        message_data = {
+            "id": "test123",
+            "threadId": "thread123",
+            "payload": {
+                "headers": [
+                    {"name": "To", "value": "to@example.com"},
+                    {"name": "CC", "value": "Cc User <cc@example.com>"},
+                    {"name": "bcc", "value": "bcc@example.com"},
+                ]
+            },
+        }
+
+        message = Message.from_raw(message_data, {})
+        assert message.recipients["to"][0]["email"] == "to@example.com"
+        assert message.recipients["cc"] == [
+            {"email": "cc@example.com", "name": "Cc User"}
+        ]
+        assert message.recipients["bcc"][0]["email"] == "bcc@example.com"
@@ -5,6 +5,7 @@ import tempfile
 import os
 from gmail_to_sqlite.db import database_proxy, SchemaVersion, Message
 from gmail_to_sqlite.migrations import (
+    MIGRATIONS,
     get_schema_version,
     set_schema_version,
     run_migrations,
@@ -13,8 +14,20 @@ from gmail_to_sqlite.migrations import (
 from gmail_to_sqlite.schema_migrations.v1_add_is_deleted_column import (
     run as migration_v1_run,
 )
+from gmail_to_sqlite.schema_migrations.v2_add_timestamp_index import (
+    run as migration_v2_run,
+)
+from gmail_to_sqlite.schema_migrations import v3_add_sender_email_index
+from gmail_to_sqlite.schema_migrations.v3_add_sender_email_index import (
+    run as migration_v3_run,
+)
 from peewee import SqliteDatabase
 
+# Migrations after v2 are deferred on SQLite versions without ->> support
+LATEST_SUPPORTED_VERSION = (
+    MIGRATIONS[-1][0] if v3_add_sender_email_index.is_supported() else 2
+)
+
 
 class TestMigrations:
     """Test migration operations."""
@@ -31,6 +44,14 @@ class TestMigrations:
         if hasattr(self, "db") and self.db:
             self.db.close()
 
+    def _index_exists(self, index_name):
+        """Check whether an index exists in the test database."""
+        cursor = self.db.execute_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (index_name,),
+        )
+        return cursor.fetchone() is not None
+
     def test_schema_version_functions(self):
         """Test schema version tracking functions."""
         # Create schema version table
@@ -57,26 +78,64 @@ class TestMigrations:
         success = run_migrations()
         assert success is True
 
-        # Check that schema version is set to 1
+        # Check that schema version is set to the latest migration
         version = get_schema_version()
-        assert version == 1
+        assert version == LATEST_SUPPORTED_VERSION
 
         # Check that is_deleted column was added
         assert column_exists("messages", "is_deleted") is True
 
+        # Check that the timestamp index was created
+        assert self._index_exists("message_timestamp") is True
+
     def test_run_migrations_already_up_to_date(self):
         """Test running migrations when database is already up to date."""
-        # Create tables and set version to 1
+        # Create tables and set version to the latest migration
+        latest_version = MIGRATIONS[-1][0]
         self.db.create_tables([SchemaVersion, Message])
-        set_schema_version(1)
+        set_schema_version(latest_version)
 
         # Run migrations
         success = run_migrations()
         assert success is True
 
-        # Version should still be 1
+        # Version should be unchanged
         version = get_schema_version()
-        assert version == 1
+        assert version == latest_version
+
+    def test_run_migrations_from_v1(self):
+        """Test that a v1 database is upgraded by the remaining migrations."""
+        self.db.create_tables([SchemaVersion, Message])
+        set_schema_version(1)
+
+        success = run_migrations()
+        assert success is True
+
+        assert get_schema_version() == LATEST_SUPPORTED_VERSION
+        assert self._index_exists("message_timestamp") is True
+
+    @pytest.mark.skipif(
+        not v3_add_sender_email_index.is_supported(),
+        reason="SQLite without ->> support cannot create the index",
+    )
+    def test_run_migrations_defers_unsupported_migration(self, monkeypatch):
+        """Test that an unsupported migration is retried once SQLite supports it."""
+        self.db.create_tables([SchemaVersion, Message])
+        set_schema_version(2)
+
+        # Pretend SQLite is too old for the v3 index expression
+        monkeypatch.setattr(
+            v3_add_sender_email_index, "MIN_SQLITE_VERSION", (999, 0, 0)
+        )
+        assert run_migrations() is True
+        assert get_schema_version() == 2
+        assert self._index_exists("message_sender_email") is False
+
+        # After an upgrade the deferred migration runs
+        monkeypatch.undo()
+        assert run_migrations() is True
+        assert get_schema_version() == 3
+        assert self._index_exists("message_sender_email") is True
 
     def test_migration_v1_add_is_deleted_column(self):
         """Test migration v1 directly."""
@@ -93,3 +152,47 @@ class TestMigrations:
         # Running again should still succeed (idempotent)
         success = migration_v1_run()
         assert success is True
+
+    def test_migration_v2_add_timestamp_index(self):
+        """Test migration v2 directly."""
+        self.db.create_tables([Message])
+
+        success = migration_v2_run()
+        assert success is True
+        assert self._index_exists("message_timestamp") is True
+
+        # Running again should still succeed (idempotent)
+        success = migration_v2_run()
+        assert success is True
+
+    @pytest.mark.skipif(
+        not v3_add_sender_email_index.is_supported(),
+        reason="SQLite without ->> support cannot create the index",
+    )
+    def test_migration_v3_add_sender_email_index(self):
+        """Test migration v3 directly."""
+        self.db.create_tables([Message])
+
+        success = migration_v3_run()
+        assert success is True
+        assert self._index_exists("message_sender_email") is True
+
+        # Sender lookups should be able to use the index
+        plan = self.db.execute_sql(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM messages "
+            "WHERE sender->>'$.email' = ?",
+            ("foo@example.com",),
+        ).fetchall()
+        assert any("message_sender_email" in row[-1] for row in plan)
+
+        # Running again should still succeed (idempotent)
+        success = migration_v3_run()
+        assert success is True
+
+    def test_column_exists(self):
+        """Test column lookup against existing and missing columns."""
+        self.db.create_tables([Message])
+
+        assert column_exists("messages", "message_id") is True
+        assert column_exists("messages", "no_such_column") is False
+        assert column_exists("no_such_table", "message_id") is False
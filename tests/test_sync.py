@@ -0,0 +1,298 @@
+"""Tests for synchronization functionality."""
+
+import concurrent.futures
+import json
+import threading
+import time
+from unittest import mock
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from gmail_to_sqlite import sync
+from gmail_to_sqlite.constants import (
+    MAX_QUEUED_TASKS_PER_WORKER,
+    MAX_RETRY_DELAY_SECONDS,
+    RETRY_DELAY_SECONDS,
+)
+from gmail_to_sqlite.sync import (
+    _interruptible_sleep,
+    _is_retryable_http_error,
+    _retry_after_seconds,
+    _retry_delay,
+)
+
+
+def make_http_error(status, body=None, headers=None):
+    """Build an HttpError with the given status, JSON body and headers."""
+    response = httplib2.Response({"status": status, **(headers or {})})
+    content = json.dumps(body or {"error": {"code": status}}).encode("utf-8")
+    return HttpError(response, content)
+
+
+class TestRetryableHttpError:
+    """Test classification of retryable Gmail API errors."""
+
+    def test_rate_limited_429(self):
+        """Test that a 429 is retried."""
+        assert _is_retryable_http_error(make_http_error(429)) is True
+
+    @pytest.mark.parametrize("status", [500, 503])
+    def test_server_error(self, status):
+        """Test that 5xx errors are retried."""
+        assert _is_retryable_http_error(make_http_error(status)) is True
+
+    def test_403_legacy_rate_limit_reason(self):
+        """Test a 403 carrying only the legacy errors list."""
+        body = {
+            "error": {
+                "code": 403,
+                "errors": [{"reason": "userRateLimitExceeded"}],
+            }
+        }
+        assert _is_retryable_http_error(make_http_error(403, body)) is True
+
+    def test_403_rate_limit_with_error_info_details(self):
+        """Test a 403 carrying both the errors list and ErrorInfo details."""
+        body = {
+            "error": {
+                "code": 403,
+                "errors": [{"reason": "rateLimitExceeded"}],
+                "details": [
+                    {
+                        "@type": "type.googleapis.com/google.rpc.ErrorInfo",
+                        "reason": "RATE_LIMIT_EXCEEDED",
+                    }
+                ],
+            }
+        }
+        assert _is_retryable_http_error(make_http_error(403, body)) is True
+
+    def test_403_error_info_only(self):
+        """Test a 403 carrying only the ErrorInfo rate-limit reason."""
+        body = {
+            "error": {
+                "code": 403,
+                "details": [
+                    {
+                        "@type": "type.googleapis.com/google.rpc.ErrorInfo",
+                        "reason": "RATE_LIMIT_EXCEEDED",
+                    }
+                ],
+            }
+        }
+        assert _is_retryable_http_error(make_http_error(403, body)) is True
+
+    def test_plain_403_not_retried(self):
+        """Test that a permission 403 is not retried."""
+        body = {"error": {"code": 403, "errors": [{"reason": "forbidden"}]}}
+        assert _is_retryable_http_error(make_http_error(403, body)) is False
+
+    def test_404_not_retried(self):
+        """Test that a 404 is not retried."""
+        assert _is_retryable_http_error(make_http_error(404)) is False
+
+
+class TestRetryDelay:
+    """Test the jittered exponential retry backoff."""
+
+    @pytest.mark.parametrize("attempt", range(6))
+    def test_delay_within_jitter_bounds(self, attempt):
+        """Test that each delay lies in [delay/2, delay] of the capped backoff."""
+        delay = min(MAX_RETRY_DELAY_SECONDS, RETRY_DELAY_SECONDS * 2**attempt)
+        for _ in range(50):
+            assert delay / 2 <= _retry_delay(attempt) <= delay
+
+    def test_delay_capped(self):
+        """Test that large attempt numbers never exceed the cap."""
+        for _ in range(50):
+            assert _retry_delay(30) <= MAX_RETRY_DELAY_SECONDS
+
+
+class TestRetryAfter:
+    """Test parsing of the Retry-After header."""
+
+    def test_seconds(self):
+        """Test a delay given in seconds."""
+        error = make_http_error(429, headers={"retry-after": "7"})
+        assert _retry_after_seconds(error) == 7.0
+
+    def test_http_date_ignored(self):
+        """Test that an HTTP-date value falls back to the computed backoff."""
+        error = make_http_error(
+            429, headers={"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        )
+        assert _retry_after_seconds(error) is None
+
+    def test_missing_header(self):
+        """Test a response without a Retry-After header."""
+        assert _retry_after_seconds(make_http_error(429)) is None
+
+    def test_negative_clamped_to_zero(self):
+        """Test that negative values are clamped to zero."""
+        error = make_http_error(429, headers={"retry-after": "-5"})
+        assert _retry_after_seconds(error) == 0.0
+
+    def test_capped(self):
+        """Test that large values are capped at MAX_RETRY_DELAY_SECONDS."""
+        error = make_http_error(429, headers={"retry-after": "3600"})
+        assert _retry_after_seconds(error) == MAX_RETRY_DELAY_SECONDS
+
+
+class TestFetchMessageRetry:
+    """Test the delay used when retrying a failed message fetch."""
+
+    def fetch_with_error(self, error):
+        """Fetch a message whose first request fails with the given error."""
+        service = mock.Mock()
+        service.users().messages().get().execute.side_effect = [error, {}]
+        with mock.patch.object(
+            sync, "_interruptible_sleep"
+        ) as sleep, mock.patch.object(sync.message.Message, "from_raw"):
+            sync._fetch_message(service, "msg1", {})
+        return sleep.call_args.args[0]
+
+    def test_retry_after_zero_honored(self):
+        """Test that a Retry-After of zero is not replaced by the backoff."""
+        error = make_http_error(429, headers={"retry-after": "0"})
+        assert self.fetch_with_error(error) == 0.0
+
+    def test_backoff_without_retry_after(self):
+        """Test that the computed backoff is used without a Retry-After header."""
+        delay = self.fetch_with_error(make_http_error(503))
+        assert RETRY_DELAY_SECONDS / 2 <= delay <= RETRY_DELAY_SECONDS
+
+
+class TestInterruptibleSleep:
+    """Test the interruptible retry sleep."""
+
+    def test_sleeps_without_interrupt(self):
+        """Test that the full delay elapses when not interrupted."""
+        start = time.monotonic()
+        _interruptible_sleep(0.05, lambda: False)
+        assert time.monotonic() - start >= 0.05
+
+    def test_interrupt_during_sleep(self):
+        """Test that an interrupt cuts a long sleep short."""
+        deadline = time.monotonic() + 0.2
+        start = time.monotonic()
+        with pytest.raises(InterruptedError):
+            _interruptible_sleep(
+                MAX_RETRY_DELAY_SECONDS, lambda: time.monotonic() >= deadline
+            )
+        assert time.monotonic() - start < 2
+
+
+class TestGetMessageIds:
+    """Test collection of message IDs from Gmail."""
+
+    def test_overlapping_pages_deduplicated(self):
+        """Test that IDs repeated across pages are kept once in first-seen order."""
+        service = mock.Mock()
+        service.users().messages().list().execute.side_effect = [
+            {
+                "messages": [{"id": "a"}, {"id": "b"}, {"id": "c"}],
+                "nextPageToken": "page2",
+            },
+            {"messages": [{"id": "c"}, {"id": "b"}, {"id": "d"}]},
+        ]
+
+        message_ids = sync.get_message_ids_from_gmail(service)
+
+        assert message_ids == ["a", "b", "c", "d"]
+        list_calls = service.users().messages().list.call_args_list
+        assert list_calls[-1].kwargs["pageToken"] == "page2"
+
+
+class TrackingExecutor(concurrent.futures.ThreadPoolExecutor):
+    """Thread pool that records how many submitted futures are outstanding."""
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.outstanding = 0
+        self.max_outstanding = 0
+        TrackingExecutor.instances.append(self)
+
+    def submit(self, *args, **kwargs):
+        with self.lock:
+            self.submitted += 1
+            self.outstanding += 1
+            self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        future = super().submit(*args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        with self.lock:
+            self.outstanding -= 1
+
+
+class TestAllMessages:
+    """Test the bounded parallel fetch loop in all_messages."""
+
+    num_workers = 2
+
+    def run_sync(self, message_ids, fetch, check_shutdown=None):
+        """Run all_messages with the Gmail API and database patched out."""
+        TrackingExecutor.instances = []
+        with mock.patch.object(
+            sync, "_create_service", return_value=object()
+        ), mock.patch.object(sync, "get_labels", return_value={}), mock.patch.object(
+            sync, "get_message_ids_from_gmail", return_value=message_ids
+        ), mock.patch.object(
+            sync, "_fetch_message", side_effect=fetch
+        ), mock.patch.object(
+            sync.db, "create_message"
+        ) as create_message, mock.patch.object(
+            sync.db, "last_indexed", return_value=None
+        ), mock.patch.object(
+            sync.db, "first_indexed", return_value=None
+        ), mock.patch.object(
+            sync.concurrent.futures, "ThreadPoolExecutor", TrackingExecutor
+        ):
+            synced = sync.all_messages(
+                None, num_workers=self.num_workers, check_shutdown=check_shutdown
+            )
+        return synced, create_message, TrackingExecutor.instances[0]
+
+    def test_processes_every_id_once_within_window(self):
+        """Test each ID is synced once and the queue never exceeds the window."""
+        message_ids = [f"msg{i}" for i in range(200)]
+
+        def fetch(service, message_id, labels, check_interrupt=None):
+            time.sleep(0.001)
+            return mock.Mock(id=message_id, timestamp=None)
+
+        synced, create_message, executor = self.run_sync(message_ids, fetch)
+
+        assert synced == len(message_ids)
+        stored_ids = [call.args[0].id for call in create_message.call_args_list]
+        assert sorted(stored_ids) == sorted(message_ids)
+        assert executor.submitted == len(message_ids)
+        assert (
+            executor.max_outstanding <= self.num_workers * MAX_QUEUED_TASKS_PER_WORKER
+        )
+
+    def test_shutdown_stops_submissions(self):
+        """Test that no new tasks are submitted once shutdown is requested."""
+        message_ids = [f"msg{i}" for i in range(200)]
+        shutdown = threading.Event()
+        fetched = []
+
+        def fetch(service, message_id, labels, check_interrupt=None):
+            fetched.append(message_id)
+            if len(fetched) == 10:
+                shutdown.set()
+            time.sleep(0.001)
+            return mock.Mock(id=message_id, timestamp=None)
+
+        _, _, executor = self.run_sync(message_ids, fetch, shutdown.is_set)
+
+        window = self.num_workers * MAX_QUEUED_TASKS_PER_WORKER
+        assert executor.submitted <= 10 + window
+        assert len(fetched) < len(message_ids)